@@ -1,34 +1,108 @@
 from flask import Flask
 from flask_cors import CORS
-from db import init_db
+from werkzeug.middleware.proxy_fix import ProxyFix
+from db import init_db, init_auth_db
+from archive import init_archive_db, archive_worker
 from routes import api_bp
 from auth import auth_bp
+from rate_limit import rate_limiter, RATE_LIMIT_ENABLED
+from compression import init_compression, COMPRESSION_ENABLED
+from repository import database
 import os
 
-app = Flask(__name__)
+ARCHIVE_ENABLED = os.getenv('ARCHIVE_ENABLED', 'true').lower() == 'true'
 
-# CORS Configuration
-CORS(app)
+# Number of reverse proxies in front of the app whose X-Forwarded-For is trusted
+TRUSTED_PROXIES = int(os.getenv('TRUSTED_PROXIES', 0))
 
-# Initialize database
-init_db()
+_storage_ready = False
 
-# Register blueprints
-app.register_blueprint(api_bp, url_prefix='/api')
-app.register_blueprint(auth_bp, url_prefix='/api')  # Register auth separately
 
+def init_storage():
+    """Create the data directory and tables once per process.
 
-# Error handling
-@app.errorhandler(500)
-def internal_error(error):
-    return {'error': 'Something went wrong!'}, 500
+    Under gunicorn with preload_app this runs in the master, and forked
+    workers inherit the flag instead of repeating the DDL.
+    """
+    global _storage_ready
+    if _storage_ready:
+        return
+
+    init_db()
+    init_auth_db()
+    init_archive_db()
+    _storage_ready = True
+
+
+def start_background_jobs():
+    """Move long-closed tickets out of the hot table in the background"""
+    if ARCHIVE_ENABLED:
+        archive_worker.start()
+
+
+def preload_modules():
+    """Import the modules handlers defer (bcrypt, pydantic schemas).
+
+    Called in the gunicorn master so forked workers share the loaded pages.
+    """
+    import bcrypt
+    import validators
+
+
+def warm_up():
+    """Open this process's pooled connections before the first request"""
+    database.warm()
+
+
+def create_app():
+    app = Flask(__name__)
+    
+    # Only trust forwarded client IPs when a proxy is explicitly configured
+    if TRUSTED_PROXIES:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXIES)
+
+    # CORS Configuration
+    CORS(app)
+
+    # Rate limiting and concurrency caps
+    if RATE_LIMIT_ENABLED:
+        rate_limiter.init_app(app)
+        if not TRUSTED_PROXIES:
+            print('⚠️  Rate limiting by remote address with TRUSTED_PROXIES=0; '
+                  'behind a reverse proxy all clients share one bucket')
+
+    # Response compression
+    if COMPRESSION_ENABLED:
+        init_compression(app)
+
+    # Initialize database
+    init_storage()
+
+    # Return repository connections to the pool after each request
+    app.teardown_appcontext(database.release)
+
+    # Register blueprints
+    app.register_blueprint(api_bp, url_prefix='/api')
+    app.register_blueprint(auth_bp, url_prefix='/api')  # Register auth separately
+
+    # Error handling
+    @app.errorhandler(500)
+    def internal_error(error):
+        return {'error': 'Something went wrong!'}, 500
+
+    @app.errorhandler(404)
+    def not_found(error):
+        return {'error': 'Not found'}, 404
+
+    return app
 
-@app.errorhandler(404)
-def not_found(error):
-    return {'error': 'Not found'}, 404
 
 if __name__ == '__main__':
     PORT = int(os.getenv('PORT', 4000))
+    app = create_app()
+    # With the debug reloader, only the child process that serves requests archives
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_background_jobs()
     print(f'🚀 Server running on http://localhost:{PORT}')
     print(f'📊 API available at http://localhost:{PORT}/api')
-    app.run(debug=True, port=PORT, host='0.0.0.0')
\ No newline at end of file
+    app.run(debug=True, port=PORT, host='0.0.0.0')
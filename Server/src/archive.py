@@ -0,0 +1,145 @@
+import sqlite3
+import os
+import threading
+from datetime import datetime, timedelta
+from db import ARCHIVE_DB_PATH
+from repository import archive_repo
+
+# Archive settings
+ARCHIVE_AFTER_DAYS = int(os.getenv('ARCHIVE_AFTER_DAYS', 30))
+ARCHIVE_BATCH_SIZE = int(os.getenv('ARCHIVE_BATCH_SIZE', 500))
+ARCHIVE_INTERVAL_SECONDS = int(os.getenv('ARCHIVE_INTERVAL_SECONDS', 3600))
+
+
+def get_archive_db():
+    """Get archive database connection"""
+    conn = sqlite3.connect(ARCHIVE_DB_PATH)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def init_archive_db():
+    """Initialize archive database with tables"""
+    os.makedirs(os.path.dirname(ARCHIVE_DB_PATH), exist_ok=True)
+
+    conn = get_archive_db()
+    cursor = conn.cursor()
+
+    cursor.executescript('''
+        CREATE TABLE IF NOT EXISTS tickets (
+            id TEXT PRIMARY KEY,
+            createdAt TEXT NOT NULL,
+            updatedAt TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT NOT NULL,
+            priority TEXT NOT NULL,
+            status TEXT NOT NULL,
+            reporter TEXT NOT NULL,
+            projectId TEXT,
+            archivedAt TEXT NOT NULL
+        );
+
+        CREATE TABLE IF NOT EXISTS comments (
+            id TEXT PRIMARY KEY,
+            createdAt TEXT NOT NULL,
+            author TEXT NOT NULL,
+            body TEXT NOT NULL,
+            ticketId TEXT NOT NULL
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_archive_comments_ticket ON comments(ticketId);
+    ''')
+
+    conn.commit()
+    conn.close()
+
+
+def archive_closed_tickets(max_age_days=None, batch_size=None):
+    """Move one batch of long-closed tickets (and their comments) to the archive.
+
+    Tickets are eligible when status is CLOSED and updatedAt is older than
+    max_age_days. Returns the number of tickets moved.
+    """
+    max_age_days = ARCHIVE_AFTER_DAYS if max_age_days is None else max_age_days
+    batch_size = batch_size or ARCHIVE_BATCH_SIZE
+    cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+
+    return archive_repo.archive_batch(cutoff, batch_size)
+
+
+def run_archive(max_age_days=None, batch_size=None):
+    """Archive all eligible tickets batch by batch and report the working-set change"""
+    before = get_archive_stats()
+
+    archived = 0
+    batches = 0
+    while True:
+        moved = archive_closed_tickets(max_age_days, batch_size)
+        if not moved:
+            break
+        archived += moved
+        batches += 1
+
+    after = get_archive_stats()
+
+    return {
+        'archivedTickets': archived,
+        'batches': batches,
+        'hotTicketsBefore': before['hotTickets'],
+        'hotTicketsAfter': after['hotTickets'],
+        'hotCommentsBefore': before['hotComments'],
+        'hotCommentsAfter': after['hotComments'],
+        'hotBytesBefore': before['hotBytes'],
+        'hotBytesAfter': after['hotBytes'],
+    }
+
+
+def get_archive_stats():
+    """Get row counts and approximate sizes for hot and archived data"""
+    return archive_repo.stats()
+
+
+class ArchiveWorker:
+    """Background thread that periodically archives closed tickets"""
+
+    def __init__(self, interval=ARCHIVE_INTERVAL_SECONDS):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, name='archive-worker', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def run_forever(self):
+        """Archive every `interval` seconds until stop() is called"""
+        while not self._stop.wait(self.interval):
+            try:
+                report = run_archive()
+                if report['archivedTickets']:
+                    print(f"📦 Archived {report['archivedTickets']} tickets "
+                          f"({report['hotBytesBefore']} -> {report['hotBytesAfter']} hot bytes)")
+            except Exception as e:
+                print(f'Archive error: {e}')
+
+
+# Singleton instance
+archive_worker = ArchiveWorker()
+
+
+if __name__ == '__main__':
+    # Standalone archiver for multi-process deployments (e.g. gunicorn),
+    # so only one process moves tickets
+    from db import init_db
+    init_db()
+    init_archive_db()
+    print(f'📦 Archiving tickets closed over {ARCHIVE_AFTER_DAYS} days, every {ARCHIVE_INTERVAL_SECONDS}s')
+    archive_worker.run_forever()
@@ -1,19 +1,20 @@
 from flask import Blueprint, request, jsonify
-from auth_db import auth_db
-import bcrypt
-from validators import SignupSchema, LoginSchema
-from pydantic import ValidationError
+from repository import user_repo
 
 auth_bp = Blueprint('auth', __name__)
 
 @auth_bp.route('/signup', methods=['POST'])
 def signup():
+    # bcrypt and pydantic are imported on first use to keep startup fast
+    import bcrypt
+    from validators import SignupSchema, ValidationError
+    
     try:
         # Validate input
         data = SignupSchema(**request.json)
         
         # Check if email already exists
-        existing_user = auth_db.get_user_by_email(data.email)
+        existing_user = user_repo.get_by_email(data.email)
         if existing_user:
             return jsonify({
                 'success': False,
@@ -27,7 +28,7 @@ def signup():
         ).decode('utf-8')
         
         # Create user
-        user = auth_db.create_user(data.name, data.email, hashed_password)
+        user = user_repo.create(data.name, data.email, hashed_password)
         
         if not user:
             return jsonify({
@@ -58,12 +59,16 @@ def signup():
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
+    # bcrypt and pydantic are imported on first use to keep startup fast
+    import bcrypt
+    from validators import LoginSchema, ValidationError
+    
     try:
         # Validate input
         data = LoginSchema(**request.json)
         
         # Find user by email
-        user = auth_db.get_user_by_email(data.email)
+        user = user_repo.get_by_email(data.email)
         if not user:
             return jsonify({
                 'success': False,
@@ -105,7 +110,7 @@ def login():
 @auth_bp.route('/users', methods=['GET'])
 def get_all_users():
     try:
-        users = auth_db.get_all_users()
+        users = user_repo.list_all()
         # Remove passwords from all users
         users_without_passwords = [
             {k: v for k, v in user.items() if k != 'password'}
@@ -0,0 +1,75 @@
+"""Measure bytes-on-wire and server CPU for GET /api/tickets on large boards.
+
+Runs against a throwaway database, e.g.:
+
+    python bench_payload.py 1000 10000
+"""
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = tempfile.mkdtemp(prefix='ticket-bench-')
+os.environ['DATA_DIR'] = BENCH_DIR
+os.environ.setdefault('ARCHIVE_ENABLED', 'false')
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+
+import db
+from app import create_app
+
+REPEAT = 5
+
+VARIANTS = [
+    ('json', '', {}),
+    ('json+gzip', '', {'Accept-Encoding': 'gzip'}),
+    ('columns', '&format=columns', {}),
+    ('columns+gzip', '&format=columns', {'Accept-Encoding': 'gzip'}),
+]
+
+
+def seed(count):
+    """Replace the board with `count` tickets in one project"""
+    conn = db.get_db()
+    conn.execute('DELETE FROM tickets')
+    now = time.strftime('%Y-%m-%dT%H:%M:%S')
+    conn.executemany(
+        'INSERT INTO tickets (id, createdAt, updatedAt, title, description, priority, status, reporter, projectId) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        [
+            (db.generate_id() + str(i), now, now, f'Ticket number {i}',
+             f'Description for ticket {i} with some realistic filler text.',
+             ('LOW', 'MEDIUM', 'HIGH')[i % 3], ('OPEN', 'IN_PROGRESS', 'CLOSED')[i % 3],
+             f'user{i % 25}', 'bench')
+            for i in range(count)
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+
+def measure(client, query, headers):
+    """Return (bytes on wire, best CPU seconds) for one request shape"""
+    best_cpu = None
+    size = 0
+    for _ in range(REPEAT):
+        start = time.process_time()
+        response = client.get(f'/api/tickets?projectId=bench{query}', headers=headers)
+        body = response.get_data()
+        cpu = time.process_time() - start
+        size = len(body)
+        best_cpu = cpu if best_cpu is None else min(best_cpu, cpu)
+    return size, best_cpu
+
+
+def main(sizes):
+    client = create_app().test_client()
+    print(f"{'tickets':>8} {'variant':<14} {'bytes':>12} {'cpu ms':>9}")
+    for count in sizes:
+        seed(count)
+        for name, query, headers in VARIANTS:
+            size, cpu = measure(client, query, headers)
+            print(f'{count:>8} {name:<14} {size:>12,} {cpu * 1000:>9.1f}')
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000])
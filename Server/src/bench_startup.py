@@ -0,0 +1,76 @@
+"""Measure import, app creation and first-request latency in a fresh interpreter.
+
+Each run starts a new Python process against a throwaway database, e.g.:
+
+    python bench_startup.py 5
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+# Runs inside the child process and prints one JSON line of timings in ms
+CHILD = r'''
+import json, time
+start = time.perf_counter()
+import app as app_module
+imported = time.perf_counter()
+app = app_module.create_app()
+created = time.perf_counter()
+client = app.test_client()
+
+def timed(method, url, **kwargs):
+    t = time.perf_counter()
+    getattr(client, method)(url, **kwargs)
+    return (time.perf_counter() - t) * 1000
+
+login = {'email': 'bench@example.com', 'password': 'secret'}
+result = {
+    'import': (imported - start) * 1000,
+    'create_app': (created - imported) * 1000,
+    'first_list': timed('get', '/api/tickets'),
+    'second_list': timed('get', '/api/tickets'),
+    # First use of the deferred bcrypt/pydantic imports, plus one bcrypt hash
+    'signup': timed('post', '/api/signup', json=dict(login, name='Bench')),
+    # Successful logins, so bcrypt.checkpw actually runs
+    'first_login': timed('post', '/api/login', json=login),
+    'second_login': timed('post', '/api/login', json=login),
+}
+assert client.post('/api/login', json=login).status_code == 200
+print(json.dumps(result))
+'''
+
+COLUMNS = ['import', 'create_app', 'first_list', 'second_list', 'signup', 'first_login', 'second_login']
+
+
+def run_once():
+    # A fresh directory per run so the signup always creates the user
+    data_dir = tempfile.mkdtemp(prefix='ticket-bench-')
+    env = dict(
+        os.environ,
+        DATA_DIR=data_dir,
+        ARCHIVE_ENABLED='false',
+        RATE_LIMIT_ENABLED='false',
+    )
+    output = subprocess.run(
+        [sys.executable, '-c', CHILD],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(runs):
+    results = [run_once() for _ in range(runs)]
+
+    print(' '.join(f'{name:>13}' for name in COLUMNS) + '  (ms, median)')
+    medians = []
+    for name in COLUMNS:
+        values = sorted(result[name] for result in results)
+        medians.append(values[len(values) // 2])
+    print(' '.join(f'{value:>13.1f}' for value in medians))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
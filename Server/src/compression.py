@@ -0,0 +1,66 @@
+import os
+import zlib
+from flask import request
+
+# Compression settings
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+COMPRESSION_MIN_BYTES = int(os.getenv('COMPRESSION_MIN_BYTES', 1024))
+COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', 6))
+
+COMPRESSIBLE_TYPES = ('application/json', 'text/')
+
+# zlib window bits for each Content-Encoding
+ENCODINGS = {
+    'gzip': 16 + zlib.MAX_WBITS,
+    'deflate': zlib.MAX_WBITS,
+}
+
+
+def choose_encoding(accept_encodings):
+    """Pick the best supported encoding the client accepts, or None"""
+    best = None
+    best_quality = 0
+    for encoding in ENCODINGS:
+        quality = accept_encodings[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding, level=COMPRESSION_LEVEL):
+    """Compress a response body"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+    return compressor.compress(data) + compressor.flush()
+
+
+def _should_compress(response):
+    if response.status_code < 200 or response.status_code in (204, 304):
+        return False
+    if response.direct_passthrough or response.is_streamed:
+        return False
+    if 'Content-Encoding' in response.headers:
+        return False
+    if not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES):
+        return False
+    return (response.content_length or 0) >= COMPRESSION_MIN_BYTES
+
+
+def compress_response(response):
+    """after_request hook: gzip/deflate large responses when the client accepts it"""
+    response.vary.add('Accept-Encoding')
+
+    if not _should_compress(response):
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if not encoding:
+        return response
+
+    response.set_data(compress(response.get_data(), encoding))
+
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_compression(app):
+    app.after_request(compress_response)
@@ -1,15 +1,26 @@
 import sqlite3
 import os
+import shutil
 from datetime import datetime
 import random
 import string
 
-# Database paths
-DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
-DB_PATH = os.path.join(DATA_DIR, 'app.db')
+# Database paths. DATA_DIR is the single storage location; each file can still be overridden.
+DATA_DIR = os.getenv('DATA_DIR', os.path.join(os.path.dirname(__file__), 'data'))
+DB_PATH = os.getenv('DB_PATH', os.path.join(DATA_DIR, 'app.db'))
+AUTH_DB_PATH = os.getenv('AUTH_DB_PATH', os.path.join(DATA_DIR, 'auth.db'))
+ARCHIVE_DB_PATH = os.getenv('ARCHIVE_DB_PATH', os.path.join(DATA_DIR, 'archive.db'))
 
-# Create data directory if it doesn't exist
-os.makedirs(DATA_DIR, exist_ok=True)
+TICKET_COLUMNS = 'id, createdAt, updatedAt, title, description, priority, status, reporter, projectId'
+COMMENT_COLUMNS = 'id, createdAt, author, body, ticketId'
+
+# auth.db used to live next to the sources. It is copied into DATA_DIR on first start,
+# but only when both locations are the defaults, never into a path chosen by the operator.
+LEGACY_AUTH_DB_PATH = os.path.join(os.path.dirname(__file__), 'auth.db')
+MIGRATE_LEGACY_AUTH_DB = 'DATA_DIR' not in os.environ and 'AUTH_DB_PATH' not in os.environ
+
+# Attach auth.db to the app connection as `auth` instead of opening it separately
+ATTACH_AUTH_DB = os.getenv('ATTACH_AUTH_DB', 'false').lower() == 'true'
 
 def get_db():
     """Get database connection"""
@@ -20,6 +31,9 @@ def get_db():
 
 def init_db():
     """Initialize database with tables"""
+    # Create data directory if it doesn't exist
+    os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+    
     conn = get_db()
     cursor = conn.cursor()
     
@@ -51,12 +65,41 @@ def init_db():
             parentProject TEXT NOT NULL,
             createdAt TEXT NOT NULL
         );
+
+        -- Lets the archiver find long-closed tickets without a full scan
+        CREATE INDEX IF NOT EXISTS idx_tickets_status_updated ON tickets(status, updatedAt);
     ''')
     
     conn.commit()
     conn.close()
     print('✅ Database initialized')
 
+def init_auth_db():
+    """Create users table"""
+    os.makedirs(os.path.dirname(AUTH_DB_PATH), exist_ok=True)
+    
+    # Carry existing accounts over from the old location
+    if (MIGRATE_LEGACY_AUTH_DB and not os.path.exists(AUTH_DB_PATH)
+            and os.path.exists(LEGACY_AUTH_DB_PATH)):
+        shutil.copy2(LEGACY_AUTH_DB_PATH, AUTH_DB_PATH)
+        print(f'📦 Copied {LEGACY_AUTH_DB_PATH} to {AUTH_DB_PATH}')
+    
+    conn = sqlite3.connect(AUTH_DB_PATH)
+    cursor = conn.cursor()
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            email TEXT UNIQUE NOT NULL,
+            password TEXT NOT NULL,
+            created_at TEXT DEFAULT (datetime('now'))
+        )
+    ''')
+    
+    conn.commit()
+    conn.close()
+
 def generate_id():
     """Generate unique ID similar to TypeScript version"""
     timestamp = int(datetime.now().timestamp() * 1000)
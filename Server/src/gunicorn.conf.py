@@ -0,0 +1,21 @@
+# Run with: gunicorn -c gunicorn.conf.py
+# Workers do not archive tickets; run `python archive.py` as one separate process.
+import os
+from app import preload_modules, warm_up
+
+wsgi_app = 'app:create_app()'
+bind = f"0.0.0.0:{os.getenv('PORT', 4000)}"
+workers = int(os.getenv('WEB_CONCURRENCY', 2))
+
+# Build the app (and run the schema checks) once in the master, then fork
+preload_app = True
+
+
+def on_starting(server):
+    # Heavy imports happen once here and are shared copy-on-write by the workers
+    preload_modules()
+
+
+def post_fork(server, worker):
+    # Connections must not cross fork, so each worker opens its own
+    warm_up()
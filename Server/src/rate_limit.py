@@ -0,0 +1,161 @@
+import os
+import time
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from flask import request, jsonify, g
+
+# Rate limit settings. Buckets are keyed by client IP: behind a reverse proxy
+# (including the Vite dev proxy) set TRUSTED_PROXIES, or every user shares one bucket.
+RATE_LIMIT_ENABLED = os.getenv('RATE_LIMIT_ENABLED', 'true').lower() == 'true'
+RATE_LIMIT_CAPACITY = float(os.getenv('RATE_LIMIT_CAPACITY', 60))
+RATE_LIMIT_REFILL_PER_SECOND = float(os.getenv('RATE_LIMIT_REFILL_PER_SECOND', 1))
+RATE_LIMIT_MAX_BUCKETS = int(os.getenv('RATE_LIMIT_MAX_BUCKETS', 100000))
+RATE_LIMIT_SWEEP_SECONDS = 60
+
+# Token cost per request, keyed by (method, endpoint). Anything else costs 1.
+ROUTE_COSTS = {
+    ('POST', 'auth.login'): 10,
+    ('POST', 'auth.signup'): 10,
+    ('POST', 'api.archive_run'): 20,
+}
+SEARCH_COST = 5
+
+# Max in-flight requests per expensive endpoint. Extra requests get a 503.
+CONCURRENCY_LIMITS = {
+    'auth.login': int(os.getenv('LOGIN_CONCURRENCY', 4)),
+    'auth.signup': int(os.getenv('SIGNUP_CONCURRENCY', 4)),
+    'api.list_tickets:search': int(os.getenv('SEARCH_CONCURRENCY', 8)),
+    'api.archive_run': 1,
+}
+
+
+class RateLimitBackend(ABC):
+    """Storage for token buckets. Subclass to share buckets across workers (e.g. Redis)."""
+
+    @abstractmethod
+    def consume(self, key, cost, capacity, refill_rate):
+        """Take `cost` tokens from the bucket for `key`.
+
+        Returns (allowed, retry_after_seconds).
+        """
+
+
+class InMemoryBackend(RateLimitBackend):
+    """Per-process token buckets.
+
+    Buckets that have refilled to capacity are dropped, since a missing bucket
+    starts full anyway. Beyond max_buckets the least recently used are evicted.
+    """
+
+    def __init__(self, max_buckets=RATE_LIMIT_MAX_BUCKETS, sweep_interval=RATE_LIMIT_SWEEP_SECONDS):
+        self.max_buckets = max_buckets
+        self.sweep_interval = sweep_interval
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+
+    def consume(self, key, cost, capacity, refill_rate):
+        now = time.monotonic()
+
+        with self._lock:
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now, capacity, refill_rate)
+
+            tokens, last = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - last) * refill_rate)
+
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_buckets:
+                self._buckets.popitem(last=False)
+
+            if allowed:
+                return True, 0
+            return False, (cost - tokens) / refill_rate
+
+    def _sweep(self, now, capacity, refill_rate):
+        """Drop buckets that would already be full again"""
+        full = [
+            key for key, (tokens, last) in self._buckets.items()
+            if tokens + (now - last) * refill_rate >= capacity
+        ]
+        for key in full:
+            del self._buckets[key]
+        self._last_sweep = now
+
+
+class RateLimiter:
+    """Token-bucket limiter and concurrency caps installed as Flask hooks"""
+
+    def __init__(self, backend=None, capacity=RATE_LIMIT_CAPACITY,
+                 refill_rate=RATE_LIMIT_REFILL_PER_SECOND):
+        self.backend = backend or InMemoryBackend()
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self._semaphores = {
+            name: threading.BoundedSemaphore(limit)
+            for name, limit in CONCURRENCY_LIMITS.items()
+        }
+
+    def init_app(self, app):
+        app.before_request(self._before_request)
+        app.teardown_request(self._teardown_request)
+
+    def _client_key(self):
+        """Identify the caller by IP.
+
+        Client-supplied headers are ignored; behind a proxy, set TRUSTED_PROXIES
+        so ProxyFix rewrites remote_addr from X-Forwarded-For.
+        """
+        return f'ip:{request.remote_addr}'
+
+    def _route_key(self):
+        if request.endpoint == 'api.list_tickets' and request.args.get('q'):
+            return 'api.list_tickets:search'
+        return request.endpoint
+
+    def _cost(self, route_key):
+        if route_key == 'api.list_tickets:search':
+            return SEARCH_COST
+        return ROUTE_COSTS.get((request.method, request.endpoint), 1)
+
+    def _before_request(self):
+        if request.method == 'OPTIONS' or request.endpoint is None:
+            return None
+
+        route_key = self._route_key()
+
+        # Take the concurrency slot first so requests shed with 503 are not charged tokens
+        semaphore = self._semaphores.get(route_key)
+        if semaphore is not None:
+            if not semaphore.acquire(blocking=False):
+                response = jsonify({'error': 'Server busy, try again shortly'})
+                response.headers['Retry-After'] = '1'
+                return response, 503
+            g.rate_limit_semaphore = semaphore
+
+        allowed, retry_after = self.backend.consume(
+            self._client_key(), self._cost(route_key), self.capacity, self.refill_rate
+        )
+
+        if not allowed:
+            # The slot is released by _teardown_request
+            response = jsonify({'error': 'Too many requests'})
+            response.headers['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+            return response, 429
+
+        return None
+
+    def _teardown_request(self, error=None):
+        semaphore = g.pop('rate_limit_semaphore', None)
+        if semaphore is not None:
+            semaphore.release()
+
+
+# Singleton instance
+rate_limiter = RateLimiter()
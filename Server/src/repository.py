@@ -0,0 +1,538 @@
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from functools import wraps
+from flask import g, has_app_context
+from db import (
+    DB_PATH,
+    AUTH_DB_PATH,
+    ARCHIVE_DB_PATH,
+    ATTACH_AUTH_DB,
+    TICKET_COLUMNS,
+    COMMENT_COLUMNS,
+    generate_id
+)
+
+# Per-connection prepared statement cache (sqlite3 default is 128)
+STATEMENT_CACHE_SIZE = 256
+
+# Idle connections kept open per database; more are opened under load and closed after
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 8))
+
+# Max ids bound into one IN (...) clause
+ID_BATCH_SIZE = 500
+
+TICKET_UPDATE_FIELDS = ('title', 'description', 'priority', 'status', 'reporter')
+
+# ==================== TIMING HOOKS ====================
+
+_timing_hooks = []
+
+def add_timing_hook(hook):
+    """Register hook(name, seconds), called after every repository method"""
+    _timing_hooks.append(hook)
+
+def remove_timing_hook(hook):
+    _timing_hooks.remove(hook)
+
+def timed(method):
+    """Report how long a repository method took to every timing hook"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            if _timing_hooks:
+                elapsed = time.perf_counter() - start
+                name = f'{type(self).__name__}.{method.__name__}'
+                for hook in _timing_hooks:
+                    hook(name, elapsed)
+    return wrapper
+
+# ==================== CONNECTIONS ====================
+
+class Database:
+    """Pooled SQLite connections kept open so prepared statements stay cached.
+
+    Inside a Flask app context a connection is checked out for the request and
+    returned to the pool by release() (registered as a teardown_appcontext hook).
+    Outside one, e.g. in the archive thread, each thread keeps its own.
+
+    The archive database is always attached as `archive`; auth.db is attached as
+    `auth` when attach_auth is set, otherwise it gets its own connection.
+    """
+
+    def __init__(self, path=DB_PATH, auth_path=AUTH_DB_PATH,
+                 archive_path=ARCHIVE_DB_PATH, attach_auth=ATTACH_AUTH_DB,
+                 pool_size=POOL_SIZE):
+        self.path = path
+        self.auth_path = auth_path
+        self.archive_path = archive_path
+        self.attach_auth = attach_auth
+        self.pool_size = pool_size
+        self._pools = {'conn': [], 'auth_conn': []}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _connect(self, path):
+        conn = sqlite3.connect(path, cached_statements=STATEMENT_CACHE_SIZE, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _open(self, name):
+        if name == 'auth_conn':
+            return self._connect(self.auth_path)
+
+        conn = self._connect(self.path)
+        conn.execute('PRAGMA foreign_keys = ON')
+        conn.execute('ATTACH DATABASE ? AS archive', (self.archive_path,))
+        if self.attach_auth:
+            conn.execute('ATTACH DATABASE ? AS auth', (self.auth_path,))
+        return conn
+
+    def _holder(self):
+        """Where the current caller's connections live: the app context or the thread"""
+        return g if has_app_context() else self._local
+
+    def _get(self, name):
+        holder = self._holder()
+        conn = getattr(holder, name, None)
+        if conn is None:
+            with self._lock:
+                pool = self._pools[name]
+                conn = pool.pop() if pool else None
+            if conn is None:
+                conn = self._open(name)
+            setattr(holder, name, conn)
+        return conn
+
+    def connection(self):
+        """Get the app connection for this request (or thread)"""
+        return self._get('conn')
+
+    def auth_connection(self):
+        """Get the connection for the users table"""
+        if self.attach_auth:
+            return self.connection()
+        return self._get('auth_conn')
+
+    @property
+    def users_table(self):
+        return 'auth.users' if self.attach_auth else 'users'
+
+    def warm(self):
+        """Open one connection of each kind into the pool ahead of the first request"""
+        for name in self._pools:
+            if name == 'auth_conn' and self.attach_auth:
+                continue
+            conn = self._open(name)
+            table = self.users_table if name == 'auth_conn' else 'tickets'
+            conn.execute(f'SELECT 1 FROM {table} LIMIT 1').fetchall()
+            self._put(name, conn)
+
+    def _put(self, name, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            pool = self._pools[name]
+            if len(pool) < self.pool_size:
+                pool.append(conn)
+                return
+        conn.close()
+
+    def release(self, error=None):
+        """Return the current request's (or thread's) connections to the pool"""
+        holder = self._holder()
+        for name in self._pools:
+            conn = getattr(holder, name, None)
+            if conn is not None:
+                setattr(holder, name, None)
+                self._put(name, conn)
+
+    def close(self):
+        """Close the caller's connections and everything in the pool"""
+        self.release()
+        with self._lock:
+            for pool in self._pools.values():
+                while pool:
+                    pool.pop().close()
+
+# ==================== REPOSITORIES ====================
+
+class ProjectRepo:
+    LIST_BY_PARENT = 'SELECT * FROM projects WHERE parentProject = ? ORDER BY createdAt ASC'
+    LIST_CHILD_IDS = 'SELECT id FROM projects WHERE parentProject = ?'
+    GET = 'SELECT * FROM projects WHERE id = ?'
+    INSERT = 'INSERT INTO projects (id, name, parentProject, createdAt) VALUES (?, ?, ?, ?)'
+    DELETE = 'DELETE FROM projects WHERE id = ?'
+
+    def __init__(self, database):
+        self.db = database
+
+    @timed
+    def list_by_parent(self, parent_project):
+        rows = self.db.connection().execute(self.LIST_BY_PARENT, (parent_project,)).fetchall()
+        return [dict(row) for row in rows]
+
+    @timed
+    def list_child_ids(self, parent_project):
+        rows = self.db.connection().execute(self.LIST_CHILD_IDS, (parent_project,)).fetchall()
+        return [row['id'] for row in rows]
+
+    @timed
+    def create(self, name, parent_project):
+        project_id = generate_id()
+        now = datetime.now().isoformat()
+
+        conn = self.db.connection()
+        with conn:
+            conn.execute(self.INSERT, (project_id, name, parent_project, now))
+
+        return dict(conn.execute(self.GET, (project_id,)).fetchone())
+
+    @timed
+    def delete(self, project_id):
+        """Delete a project. Returns False if it did not exist."""
+        conn = self.db.connection()
+        with conn:
+            cursor = conn.execute(self.DELETE, (project_id,))
+        return cursor.rowcount > 0
+
+
+class TicketRepo:
+    GET = 'SELECT * FROM tickets WHERE id = ?'
+    GET_ARCHIVED = 'SELECT * FROM archive.tickets WHERE id = ?'
+    EXISTS = 'SELECT 1 FROM tickets WHERE id = ?'
+    INSERT = '''
+        INSERT INTO tickets (id, createdAt, updatedAt, title, description, priority, status, reporter, projectId)
+        VALUES (?, ?, ?, ?, ?, ?, 'OPEN', ?, ?)
+    '''
+    DELETE = 'DELETE FROM tickets WHERE id = ?'
+    TOUCH = 'UPDATE tickets SET updatedAt = ? WHERE id = ?'
+
+    RESTORE_TICKET = f'''
+        INSERT INTO main.tickets ({TICKET_COLUMNS})
+        SELECT {TICKET_COLUMNS} FROM archive.tickets WHERE id = ?
+    '''
+    RESTORE_COMMENTS = f'''
+        INSERT OR REPLACE INTO main.comments ({COMMENT_COLUMNS})
+        SELECT {COMMENT_COLUMNS} FROM archive.comments WHERE ticketId = ?
+    '''
+    DELETE_ARCHIVED = 'DELETE FROM archive.tickets WHERE id = ?'
+    DELETE_ARCHIVED_COMMENTS = 'DELETE FROM archive.comments WHERE ticketId = ?'
+
+    def __init__(self, database, comments):
+        self.db = database
+        self.comments = comments
+
+    @timed
+    def get(self, ticket_id):
+        """Get a ticket with its comment count, falling back to the archive"""
+        conn = self.db.connection()
+        row = conn.execute(self.GET, (ticket_id,)).fetchone()
+        if not row:
+            row = conn.execute(self.GET_ARCHIVED, (ticket_id,)).fetchone()
+        if not row:
+            return None
+
+        ticket = dict(row)
+        ticket['commentCount'] = self.comments.count_for_tickets([ticket_id]).get(ticket_id, 0)
+        return ticket
+
+    @timed
+    def exists(self, ticket_id):
+        return self.db.connection().execute(self.EXISTS, (ticket_id,)).fetchone() is not None
+
+    @timed
+    def list(self, q='', status='', project_ids=None, include_archived=False):
+        """List tickets newest first, with comment counts.
+
+        project_ids restricts to those projects; q matches title or description.
+        """
+        where = ' WHERE 1=1'
+        params = []
+
+        if project_ids:
+            placeholders = ','.join('?' * len(project_ids))
+            where += f' AND projectId IN ({placeholders})'
+            params.extend(project_ids)
+
+        if q:
+            where += ' AND (title LIKE ? OR description LIKE ?)'
+            params.extend([f'%{q}%', f'%{q}%'])
+
+        if status and status != 'ALL':
+            where += ' AND status = ?'
+            params.append(status)
+
+        if include_archived:
+            query = (f'SELECT {TICKET_COLUMNS} FROM main.tickets{where}'
+                     f' UNION ALL SELECT {TICKET_COLUMNS} FROM archive.tickets{where}')
+            params = params + params
+        else:
+            query = f'SELECT * FROM tickets{where}'
+
+        query += ' ORDER BY updatedAt DESC'
+
+        tickets = [dict(row) for row in self.db.connection().execute(query, params).fetchall()]
+
+        counts = self.comments.count_for_tickets([t['id'] for t in tickets], include_archived)
+        for ticket in tickets:
+            ticket['commentCount'] = counts.get(ticket['id'], 0)
+
+        return tickets
+
+    @timed
+    def create(self, title, description, priority, reporter, project_id=None):
+        ticket_id = generate_id()
+        now = datetime.now().isoformat()
+
+        conn = self.db.connection()
+        with conn:
+            conn.execute(self.INSERT, (ticket_id, now, now, title, description, priority, reporter, project_id))
+
+        return dict(conn.execute(self.GET, (ticket_id,)).fetchone())
+
+    @timed
+    def update(self, ticket_id, fields):
+        """Update the given fields and bump updatedAt. Returns None if not found."""
+        columns = [name for name in TICKET_UPDATE_FIELDS if fields.get(name)]
+        values = [fields[name] for name in columns]
+
+        columns.append('updatedAt')
+        values.extend([datetime.now().isoformat(), ticket_id])
+
+        query = f"UPDATE tickets SET {', '.join(f'{name} = ?' for name in columns)} WHERE id = ?"
+
+        conn = self.db.connection()
+        with conn:
+            cursor = conn.execute(query, values)
+        if cursor.rowcount == 0:
+            # Editing an archived ticket brings it back to the hot table first
+            if not self.restore(ticket_id):
+                return None
+            with conn:
+                conn.execute(query, values)
+
+        return dict(conn.execute(self.GET, (ticket_id,)).fetchone())
+
+    @timed
+    def restore(self, ticket_id):
+        """Move an archived ticket and its comments back to the hot table.
+
+        Returns False if the ticket is not archived.
+        """
+        conn = self.db.connection()
+        with conn:
+            cursor = conn.execute(self.RESTORE_TICKET, (ticket_id,))
+            if cursor.rowcount == 0:
+                return False
+            conn.execute(self.RESTORE_COMMENTS, (ticket_id,))
+            conn.execute(self.DELETE_ARCHIVED_COMMENTS, (ticket_id,))
+            conn.execute(self.DELETE_ARCHIVED, (ticket_id,))
+        return True
+
+    @timed
+    def delete(self, ticket_id):
+        """Delete a ticket and its comments, hot or archived. Returns False if it did not exist."""
+        conn = self.db.connection()
+        with conn:
+            cursor = conn.execute(self.DELETE, (ticket_id,))
+            if cursor.rowcount > 0:
+                return True
+            # The archive has no foreign keys, so comments are removed explicitly
+            conn.execute(self.DELETE_ARCHIVED_COMMENTS, (ticket_id,))
+            cursor = conn.execute(self.DELETE_ARCHIVED, (ticket_id,))
+        return cursor.rowcount > 0
+
+
+class CommentRepo:
+    GET = 'SELECT * FROM comments WHERE id = ?'
+    LIST = 'SELECT * FROM comments WHERE ticketId = ? ORDER BY createdAt ASC'
+    LIST_ARCHIVED = 'SELECT * FROM archive.comments WHERE ticketId = ? ORDER BY createdAt ASC'
+    INSERT = '''
+        INSERT INTO comments (id, createdAt, author, body, ticketId)
+        VALUES (?, ?, ?, ?, ?)
+    '''
+
+    def __init__(self, database):
+        self.db = database
+
+    @timed
+    def list_for_ticket(self, ticket_id):
+        """Get comments for a ticket, falling back to the archive"""
+        conn = self.db.connection()
+        rows = conn.execute(self.LIST, (ticket_id,)).fetchall()
+        if not rows:
+            rows = conn.execute(self.LIST_ARCHIVED, (ticket_id,)).fetchall()
+        return [dict(row) for row in rows]
+
+    @timed
+    def count_for_tickets(self, ticket_ids, include_archived=True):
+        """Get {ticketId: count} for many tickets in one query"""
+        if not ticket_ids:
+            return {}
+
+        conn = self.db.connection()
+        counts = {}
+        for start in range(0, len(ticket_ids), ID_BATCH_SIZE):
+            batch = list(ticket_ids[start:start + ID_BATCH_SIZE])
+            placeholders = ','.join('?' * len(batch))
+            query = f'SELECT ticketId FROM main.comments WHERE ticketId IN ({placeholders})'
+            params = batch
+            if include_archived:
+                query += f' UNION ALL SELECT ticketId FROM archive.comments WHERE ticketId IN ({placeholders})'
+                params = batch + batch
+
+            rows = conn.execute(
+                f'SELECT ticketId, COUNT(*) AS count FROM ({query}) GROUP BY ticketId', params
+            ).fetchall()
+            counts.update((row['ticketId'], row['count']) for row in rows)
+
+        return counts
+
+    @timed
+    def create(self, ticket_id, author, body):
+        """Add a comment and bump the ticket's updatedAt"""
+        comment_id = generate_id()
+        now = datetime.now().isoformat()
+
+        conn = self.db.connection()
+        with conn:
+            conn.execute(self.INSERT, (comment_id, now, author, body, ticket_id))
+            conn.execute(TicketRepo.TOUCH, (now, ticket_id))
+
+        return dict(conn.execute(self.GET, (comment_id,)).fetchone())
+
+
+class UserRepo:
+    def __init__(self, database):
+        self.db = database
+        table = database.users_table
+        self.INSERT = f'INSERT INTO {table} (name, email, password) VALUES (?, ?, ?)'
+        self.GET = f'SELECT * FROM {table} WHERE id = ?'
+        self.GET_BY_EMAIL = f'SELECT * FROM {table} WHERE email = ?'
+        self.LIST = f'SELECT * FROM {table} ORDER BY created_at DESC'
+
+    @timed
+    def create(self, name, email, password):
+        """Create a user. Returns None if the email is already taken."""
+        conn = self.db.auth_connection()
+        try:
+            with conn:
+                cursor = conn.execute(self.INSERT, (name, email, password))
+        except sqlite3.IntegrityError as e:
+            print(f'Integrity error: Email {email} already exists - {e}')
+            return None
+
+        row = conn.execute(self.GET, (cursor.lastrowid,)).fetchone()
+        return dict(row) if row else None
+
+    @timed
+    def get_by_email(self, email):
+        row = self.db.auth_connection().execute(self.GET_BY_EMAIL, (email,)).fetchone()
+        return dict(row) if row else None
+
+    @timed
+    def get_by_id(self, user_id):
+        row = self.db.auth_connection().execute(self.GET, (user_id,)).fetchone()
+        return dict(row) if row else None
+
+    @timed
+    def list_all(self):
+        return [dict(row) for row in self.db.auth_connection().execute(self.LIST).fetchall()]
+
+
+class ArchiveRepo:
+    # Re-checked on every write so a ticket reopened after the id lookup stays hot
+    ELIGIBLE = "status = 'CLOSED' AND updatedAt < ?"
+    SELECT_ELIGIBLE = f'SELECT id FROM main.tickets WHERE {ELIGIBLE} LIMIT ?'
+
+    TICKET_BYTES = """
+        SELECT COALESCE(SUM(LENGTH(id) + LENGTH(title) + LENGTH(description) + LENGTH(reporter)
+                            + LENGTH(createdAt) + LENGTH(updatedAt) + LENGTH(priority)
+                            + LENGTH(status) + COALESCE(LENGTH(projectId), 0)), 0) AS size
+        FROM {schema}.tickets
+    """
+    COMMENT_BYTES = """
+        SELECT COALESCE(SUM(LENGTH(id) + LENGTH(createdAt) + LENGTH(author)
+                            + LENGTH(body) + LENGTH(ticketId)), 0) AS size
+        FROM {schema}.comments
+    """
+
+    def __init__(self, database):
+        self.db = database
+
+    @timed
+    def archive_batch(self, cutoff, batch_size):
+        """Move up to batch_size tickets closed before cutoff, with their comments.
+
+        Returns the number of tickets moved.
+        """
+        now = datetime.now().isoformat()
+        conn = self.db.connection()
+
+        # Take the write lock before reading ids so nothing changes under the batch
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            ticket_ids = [row['id'] for row in conn.execute(self.SELECT_ELIGIBLE, (cutoff, batch_size))]
+
+            if not ticket_ids:
+                conn.rollback()
+                return 0
+
+            placeholders = ','.join('?' * len(ticket_ids))
+
+            conn.execute(f'''
+                INSERT OR REPLACE INTO archive.tickets ({TICKET_COLUMNS}, archivedAt)
+                SELECT {TICKET_COLUMNS}, ? FROM main.tickets WHERE id IN ({placeholders}) AND {self.ELIGIBLE}
+            ''', [now, *ticket_ids, cutoff])
+
+            conn.execute(f'''
+                INSERT OR REPLACE INTO archive.comments ({COMMENT_COLUMNS})
+                SELECT {COMMENT_COLUMNS} FROM main.comments WHERE ticketId IN (
+                    SELECT id FROM main.tickets WHERE id IN ({placeholders}) AND {self.ELIGIBLE}
+                )
+            ''', [*ticket_ids, cutoff])
+
+            # Comments are removed by ON DELETE CASCADE
+            cursor = conn.execute(
+                f'DELETE FROM main.tickets WHERE id IN ({placeholders}) AND {self.ELIGIBLE}',
+                [*ticket_ids, cutoff]
+            )
+
+            conn.commit()
+            return cursor.rowcount
+        except Exception:
+            conn.rollback()
+            raise
+
+    @timed
+    def stats(self):
+        """Get row counts and approximate sizes for hot and archived data"""
+        conn = self.db.connection()
+
+        stats = {}
+        for schema, prefix in (('main', 'hot'), ('archive', 'archived')):
+            tickets = conn.execute(f'SELECT COUNT(*) AS count FROM {schema}.tickets').fetchone()
+            comments = conn.execute(f'SELECT COUNT(*) AS count FROM {schema}.comments').fetchone()
+            stats[f'{prefix}Tickets'] = tickets['count']
+            stats[f'{prefix}Comments'] = comments['count']
+            stats[f'{prefix}Bytes'] = (
+                conn.execute(self.TICKET_BYTES.format(schema=schema)).fetchone()['size']
+                + conn.execute(self.COMMENT_BYTES.format(schema=schema)).fetchone()['size']
+            )
+
+        return stats
+
+
+# Singleton instances
+database = Database()
+project_repo = ProjectRepo(database)
+comment_repo = CommentRepo(database)
+ticket_repo = TicketRepo(database, comment_repo)
+user_repo = UserRepo(database)
+archive_repo = ArchiveRepo(database)
@@ -1,12 +1,6 @@
 from flask import Blueprint, request, jsonify
-from db import get_db, generate_id, row_to_dict
-from validators import (
-    TicketCreateSchema, 
-    TicketUpdateSchema, 
-    CommentCreateSchema,
-    ProjectCreateSchema
-)
-from pydantic import ValidationError
+from repository import project_repo, ticket_repo, comment_repo
+from archive import get_archive_stats, run_archive
 from datetime import datetime
 from auth import auth_bp
 
@@ -15,21 +9,18 @@ api_bp = Blueprint('api', __name__)
 # Register auth routes
 # api_bp.register_blueprint(auth_bp)
 
+def to_columns(rows):
+    """Convert a list of dicts to {key: [values]} so keys are sent once"""
+    if not rows:
+        return {}
+    return {key: [row[key] for row in rows] for key in rows[0]}
+
 # ==================== PROJECT ROUTES ====================
 
 @api_bp.route('/projects/<parent_project>', methods=['GET'])
 def get_projects(parent_project):
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            'SELECT * FROM projects WHERE parentProject = ? ORDER BY createdAt ASC',
-            (parent_project,)
-        )
-        
-        projects = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        projects = project_repo.list_by_parent(parent_project)
         
         return jsonify({'success': True, 'projects': projects}), 200
     except Exception as e:
@@ -37,25 +28,13 @@ def get_projects(parent_project):
 
 @api_bp.route('/projects', methods=['POST'])
 def create_project():
+    # pydantic is imported on first use to keep startup fast
+    from validators import ProjectCreateSchema, ValidationError
+    
     try:
         data = ProjectCreateSchema(**request.json)
         
-        project_id = generate_id()
-        now = datetime.now().isoformat()
-        
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            'INSERT INTO projects (id, name, parentProject, createdAt) VALUES (?, ?, ?, ?)',
-            (project_id, data.name, data.parentProject, now)
-        )
-        
-        conn.commit()
-        
-        cursor.execute('SELECT * FROM projects WHERE id = ?', (project_id,))
-        project = dict(cursor.fetchone())
-        conn.close()
+        project = project_repo.create(data.name, data.parentProject)
         
         return jsonify({'success': True, 'project': project}), 201
     except ValidationError as e:
@@ -66,18 +45,9 @@ def create_project():
 @api_bp.route('/projects/<project_id>', methods=['DELETE'])
 def delete_project(project_id):
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM projects WHERE id = ?', (project_id,))
-        
-        if cursor.rowcount == 0:
-            conn.close()
+        if not project_repo.delete(project_id):
             return jsonify({'error': 'Project not found'}), 404
         
-        conn.commit()
-        conn.close()
-        
         return jsonify({'success': True}), 200
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
@@ -86,25 +56,15 @@ def delete_project(project_id):
 
 @api_bp.route('/tickets', methods=['POST'])
 def create_ticket():
+    # pydantic is imported on first use to keep startup fast
+    from validators import TicketCreateSchema, ValidationError
+    
     try:
         data = TicketCreateSchema(**request.json)
         
-        ticket_id = generate_id()
-        now = datetime.now().isoformat()
-        
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO tickets (id, createdAt, updatedAt, title, description, priority, status, reporter, projectId)
-            VALUES (?, ?, ?, ?, ?, ?, 'OPEN', ?, ?)
-        ''', (ticket_id, now, now, data.title, data.description, data.priority, data.reporter, data.projectId))
-        
-        conn.commit()
-        
-        cursor.execute('SELECT * FROM tickets WHERE id = ?', (ticket_id,))
-        ticket = dict(cursor.fetchone())
-        conn.close()
+        ticket = ticket_repo.create(
+            data.title, data.description, data.priority, data.reporter, data.projectId
+        )
         
         return jsonify(ticket), 201
     except ValidationError as e:
@@ -118,53 +78,23 @@ def list_tickets():
         q = request.args.get('q', '')
         status = request.args.get('status', '')
         project_id = request.args.get('projectId', '')
+        include_archived = request.args.get('includeArchived', '').lower() in ('1', 'true')
         
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        query = 'SELECT * FROM tickets WHERE 1=1'
-        params = []
-        
+        project_ids = None
         if project_id:
-            # Check if the selected project has sub-projects
-            cursor.execute('SELECT id FROM projects WHERE parentProject = ?', (project_id,))
-            sub_projects = cursor.fetchall()
-            
-            if sub_projects:
-                # It's a parent project → include all its sub-projects
-                sub_project_ids = [row['id'] for row in sub_projects]
-                placeholders = ','.join('?' * len(sub_project_ids))
-                query += f' AND projectId IN ({placeholders})'
-                params.extend(sub_project_ids)
-            else:
-                # It's a sub-project → fetch normally
-                query += ' AND projectId = ?'
-                params.append(project_id)
-        
-        if q:
-            query += ' AND (title LIKE ? OR description LIKE ?)'
-            params.extend([f'%{q}%', f'%{q}%'])
-        
-        if status and status != 'ALL':
-            query += ' AND status = ?'
-            params.append(status)
-        
-        query += ' ORDER BY updatedAt DESC'
+            # A parent project includes all its sub-projects, a sub-project only itself
+            project_ids = project_repo.list_child_ids(project_id) or [project_id]
         
-        cursor.execute(query, params)
-        tickets = [dict(row) for row in cursor.fetchall()]
+        tickets = ticket_repo.list(q, status, project_ids, include_archived)
         
-        # Add comment counts
-        tickets_with_counts = []
-        for ticket in tickets:
-            cursor.execute('SELECT COUNT(*) as count FROM comments WHERE ticketId = ?', (ticket['id'],))
-            count = cursor.fetchone()['count']
-            ticket['commentCount'] = count
-            tickets_with_counts.append(ticket)
+        if request.args.get('format') == 'columns':
+            return jsonify({
+                'format': 'columns',
+                'columns': to_columns(tickets),
+                'total': len(tickets)
+            }), 200
         
-        conn.close()
-        
-        return jsonify({'items': tickets_with_counts, 'total': len(tickets_with_counts)}), 200
+        return jsonify({'items': tickets, 'total': len(tickets)}), 200
     except Exception as e:
         print(f'Error fetching tickets: {e}')
         return jsonify({'error': 'Internal server error'}), 500
@@ -172,77 +102,32 @@ def list_tickets():
 @api_bp.route('/tickets/<ticket_id>', methods=['GET'])
 def get_ticket(ticket_id):
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM tickets WHERE id = ?', (ticket_id,))
-        ticket = cursor.fetchone()
+        ticket = ticket_repo.get(ticket_id)
         
         if not ticket:
-            conn.close()
             return jsonify({'error': 'Ticket not found'}), 404
         
-        ticket = dict(ticket)
-        
-        cursor.execute('SELECT COUNT(*) as count FROM comments WHERE ticketId = ?', (ticket_id,))
-        count = cursor.fetchone()['count']
-        ticket['commentCount'] = count
-        
-        conn.close()
-        
         return jsonify(ticket), 200
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
 @api_bp.route('/tickets/<ticket_id>', methods=['PATCH'])
 def update_ticket(ticket_id):
+    # pydantic is imported on first use to keep startup fast
+    from validators import TicketUpdateSchema, ValidationError
+    
     try:
         data = TicketUpdateSchema(**request.json)
-        now = datetime.now().isoformat()
-        
-        updates = []
-        values = []
-        
-        if data.title:
-            updates.append('title = ?')
-            values.append(data.title)
-        if data.description:
-            updates.append('description = ?')
-            values.append(data.description)
-        if data.priority:
-            updates.append('priority = ?')
-            values.append(data.priority)
-        if data.status:
-            updates.append('status = ?')
-            values.append(data.status)
-        if data.reporter:
-            updates.append('reporter = ?')
-            values.append(data.reporter)
         
-        if not updates:
+        fields = data.model_dump(exclude_none=True)
+        if not any(fields.values()):
             return jsonify({'error': 'No valid fields to update'}), 400
         
-        updates.append('updatedAt = ?')
-        values.append(now)
-        values.append(ticket_id)
+        ticket = ticket_repo.update(ticket_id, fields)
         
-        query = f"UPDATE tickets SET {', '.join(updates)} WHERE id = ?"
-        
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute(query, values)
-        
-        if cursor.rowcount == 0:
-            conn.close()
+        if not ticket:
             return jsonify({'error': 'Ticket not found'}), 404
         
-        conn.commit()
-        
-        cursor.execute('SELECT * FROM tickets WHERE id = ?', (ticket_id,))
-        ticket = dict(cursor.fetchone())
-        conn.close()
-        
         return jsonify(ticket), 200
     except ValidationError as e:
         return jsonify({'issues': [{'message': err['msg']} for err in e.errors()]}), 422
@@ -252,18 +137,9 @@ def update_ticket(ticket_id):
 @api_bp.route('/tickets/<ticket_id>', methods=['DELETE'])
 def delete_ticket(ticket_id):
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute('DELETE FROM tickets WHERE id = ?', (ticket_id,))
-        
-        if cursor.rowcount == 0:
-            conn.close()
+        if not ticket_repo.delete(ticket_id):
             return jsonify({'error': 'Ticket not found'}), 404
         
-        conn.commit()
-        conn.close()
-        
         return '', 204
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
@@ -272,34 +148,17 @@ def delete_ticket(ticket_id):
 
 @api_bp.route('/tickets/<ticket_id>/comments', methods=['POST'])
 def add_comment(ticket_id):
+    # pydantic is imported on first use to keep startup fast
+    from validators import CommentCreateSchema, ValidationError
+    
     try:
         data = CommentCreateSchema(**request.json)
         
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        # Check if ticket exists
-        cursor.execute('SELECT id FROM tickets WHERE id = ?', (ticket_id,))
-        if not cursor.fetchone():
-            conn.close()
+        # Check if ticket exists; commenting on an archived ticket restores it
+        if not ticket_repo.exists(ticket_id) and not ticket_repo.restore(ticket_id):
             return jsonify({'error': 'Ticket not found'}), 404
         
-        comment_id = generate_id()
-        now = datetime.now().isoformat()
-        
-        cursor.execute('''
-            INSERT INTO comments (id, createdAt, author, body, ticketId)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (comment_id, now, data.author, data.body, ticket_id))
-        
-        # Update ticket's updatedAt
-        cursor.execute('UPDATE tickets SET updatedAt = ? WHERE id = ?', (now, ticket_id))
-        
-        conn.commit()
-        
-        cursor.execute('SELECT * FROM comments WHERE id = ?', (comment_id,))
-        comment = dict(cursor.fetchone())
-        conn.close()
+        comment = comment_repo.create(ticket_id, data.author, data.body)
         
         return jsonify(comment), 201
     except ValidationError as e:
@@ -310,17 +169,42 @@ def add_comment(ticket_id):
 @api_bp.route('/tickets/<ticket_id>/comments', methods=['GET'])
 def list_comments(ticket_id):
     try:
-        conn = get_db()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT * FROM comments WHERE ticketId = ? ORDER BY createdAt ASC', (ticket_id,))
-        comments = [dict(row) for row in cursor.fetchall()]
-        conn.close()
+        comments = comment_repo.list_for_ticket(ticket_id)
         
         return jsonify(comments), 200
     except Exception as e:
         return jsonify({'error': 'Internal server error'}), 500
 
+# ==================== ARCHIVE ROUTES ====================
+
+@api_bp.route('/archive/stats', methods=['GET'])
+def archive_stats():
+    try:
+        return jsonify({'success': True, 'stats': get_archive_stats()}), 200
+    except Exception as e:
+        return jsonify({'error': 'Internal server error'}), 500
+
+@api_bp.route('/archive/run', methods=['POST'])
+def archive_run():
+    # pydantic is imported on first use to keep startup fast
+    from validators import ArchiveRunSchema, ValidationError
+    
+    try:
+        body = request.get_json(silent=True) if request.get_data() else {}
+        if not isinstance(body, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        
+        data = ArchiveRunSchema(**body)
+        
+        report = run_archive(max_age_days=data.maxAgeDays, batch_size=data.batchSize)
+        
+        return jsonify({'success': True, 'report': report}), 200
+    except ValidationError as e:
+        return jsonify({'issues': [{'message': err['msg']} for err in e.errors()]}), 422
+    except Exception as e:
+        print(f'Error archiving tickets: {e}')
+        return jsonify({'error': 'Internal server error'}), 500
+
 # ==================== HEALTH CHECK ====================
 
 @api_bp.route('/health', methods=['GET'])
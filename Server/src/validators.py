@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, field_validator, ValidationError
 from typing import Optional, Literal
 
 # Enums
@@ -98,4 +98,9 @@ class LoginSchema(BaseModel):
 # Project Schema
 class ProjectCreateSchema(BaseModel):
     name: str
-    parentProject: str
\ No newline at end of file
+    parentProject: str
+
+# Archive Schema
+class ArchiveRunSchema(BaseModel):
+    maxAgeDays: Optional[int] = Field(None, ge=0, le=36500)
+    batchSize: Optional[int] = Field(None, ge=1)